@@ -1,6 +1,9 @@
+import functools
+
 import reflex as rx
 from ...models.user import AuthState
 
+@functools.cache
 def login_form() -> rx.Component:
     """Create a login form."""
     return rx.vstack(
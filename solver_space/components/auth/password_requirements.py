@@ -1,13 +1,32 @@
 """Password requirements component."""
 import reflex as rx
-from typing import List
+from typing import List, Optional
 from ...utils.validation_types import ValidationCheck
 
-def requirement_item(check: ValidationCheck) -> rx.Component:
+# Shared style props for every requirement row (never mutated)
+_REQ_HOVER = {"cursor": "default"}
+_REQ_TEXT_KW = dict(color="gray.600", font_size="sm")
+_REQ_HSTACK_KW = dict(spacing="2", align_items="center")
+
+# Static checklist heading, built once and shared
+_REQUIREMENTS_HEADING = rx.text(
+    "Password requirements:",
+    font_size="sm",
+    color="gray.600",
+    font_weight="medium",
+)
+
+@rx.memo
+def requirement_item(passed: rx.Var[bool], message: rx.Var[str]) -> rx.Component:
     """Single requirement item with icon and text.
     
+    Compiled as a memoized React component. The props are primitives so
+    unchanged rows are skipped even though each state update delivers
+    fresh check objects.
+    
     Args:
-        check: The validation check to display
+        passed: Whether the requirement is met
+        message: The requirement description
         
     Returns:
         A component showing the requirement status
@@ -15,47 +34,63 @@ def requirement_item(check: ValidationCheck) -> rx.Component:
     return rx.hstack(
         rx.icon(
             rx.cond(
-                check["passed"],
+                passed,
                 "check",
                 "close"
             ),
             color=rx.cond(
-                check["passed"],
+                passed,
                 "green.500",
                 "red.500"
             ),
-            _hover={"cursor": "default"},
+            _hover=_REQ_HOVER,
         ),
         rx.text(
-            check["message"],
-            color="gray.600",
-            font_size="sm",
+            message,
+            **_REQ_TEXT_KW,
         ),
-        spacing="2",
-        align_items="center",
+        **_REQ_HSTACK_KW,
     )
 
-def password_requirements(checks: List[ValidationCheck]) -> rx.Component:
+def password_requirements(
+    checks: List[ValidationCheck],
+    show: Optional[rx.Var[bool]] = None,
+    count: Optional[int] = None,
+) -> rx.Component:
     """Password requirements checklist component.
     
     Args:
         checks: List of requirement checks with pass/fail status
+        show: If given, the checklist is only mounted while this is true
+        count: Fixed number of checks. When given, the rows are unrolled
+            instead of mapped at runtime, so ``checks`` must hold exactly
+            this many entries whenever the checklist is mounted.
         
     Returns:
         A component displaying password requirements with visual feedback
     """
-    return rx.vstack(
-        rx.text(
-            "Password requirements:",
-            font_size="sm",
-            color="gray.600",
-            font_weight="medium",
-        ),
-        rx.vstack(
+    if count is None:
+        rows = [
             rx.foreach(
                 checks,
-                requirement_item
-            ),
+                lambda check: requirement_item(
+                    passed=check["passed"],
+                    message=check["message"],
+                ),
+            )
+        ]
+    else:
+        rows = [
+            requirement_item(
+                passed=checks[i]["passed"],
+                message=checks[i]["message"],
+            )
+            for i in range(count)
+        ]
+    checklist = rx.vstack(
+        _REQUIREMENTS_HEADING,
+        rx.vstack(
+            *rows,
             spacing="1",
             align_items="start",
             padding_left="2",
@@ -65,4 +100,7 @@ def password_requirements(checks: List[ValidationCheck]) -> rx.Component:
         background="gray.50",
         padding="3",
         border_radius="md",
-    ) 
\ No newline at end of file
+    )
+    if show is None:
+        return checklist
+    return rx.cond(show, checklist) 
\ No newline at end of file
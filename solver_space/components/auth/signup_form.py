@@ -1,11 +1,30 @@
 """Signup form component with real-time validation."""
+import functools
+
 import reflex as rx
-from ...models.user import AuthState
+from ...models.user import AuthState, PASSWORD_CHECK_COUNT
 from .password_requirements import password_requirements
 from ...utils.validation_types import FormValidationState
 
+def _border(valid_var: rx.Var[bool]) -> rx.Var:
+    """Border color for an input, red while its field is invalid."""
+    return rx.cond(valid_var, "inherit", "red.500")
+
+@functools.cache
 def signup_form() -> rx.Component:
     """Enhanced signup form with real-time validation."""
+    # Per-field validation vars, bound once and shared by the nodes below
+    fvs = AuthState.form_validation_state.to(FormValidationState)
+    username_v = fvs["username"]
+    email_v = fvs["email"]
+    password_v = fvs["password"]
+    username_border = _border(username_v["valid"])
+    email_border = _border(email_v["valid"])
+    password_border = _border(password_v["valid"])
+    # Inline errors only show once the user has edited the field
+    username_error = ~username_v["valid"] & AuthState.username_touched
+    email_error = ~email_v["valid"] & AuthState.email_touched
+
     return rx.vstack(
         rx.heading("Create Account", size="3"),
         rx.cond(
@@ -26,16 +45,12 @@ def signup_form() -> rx.Component:
                     value=AuthState.username,
                     on_change=AuthState.handle_username_change,
                     required=True,
-                    border_color=rx.cond(
-                        AuthState.form_validation_state.to(FormValidationState)["username"]["valid"],
-                        "inherit",
-                        "red.500"
-                    ),
+                    border_color=username_border,
                 ),
                 rx.cond(
-                    ~AuthState.form_validation_state.to(FormValidationState)["username"]["valid"] & AuthState.username_touched,
+                    username_error,
                     rx.text(
-                        AuthState.form_validation_state.to(FormValidationState)["username"]["message"],
+                        username_v["message"],
                         color="red.500",
                         font_size="sm",
                         margin_top="-2",
@@ -51,16 +66,12 @@ def signup_form() -> rx.Component:
                     value=AuthState.email,
                     on_change=AuthState.handle_email_change,
                     required=True,
-                    border_color=rx.cond(
-                        AuthState.form_validation_state.to(FormValidationState)["email"]["valid"],
-                        "inherit",
-                        "red.500"
-                    ),
+                    border_color=email_border,
                 ),
                 rx.cond(
-                    ~AuthState.form_validation_state.to(FormValidationState)["email"]["valid"] & AuthState.email_touched,
+                    email_error,
                     rx.text(
-                        AuthState.form_validation_state.to(FormValidationState)["email"]["message"],
+                        email_v["message"],
                         color="red.500",
                         font_size="sm",
                         margin_top="-2",
@@ -76,15 +87,12 @@ def signup_form() -> rx.Component:
                     value=AuthState.password,
                     on_change=AuthState.handle_password_change,
                     required=True,
-                    border_color=rx.cond(
-                        AuthState.form_validation_state.to(FormValidationState)["password"]["valid"],
-                        "inherit",
-                        "red.500"
-                    ),
+                    border_color=password_border,
                 ),
-                rx.cond(
-                    AuthState.form_validation_state.to(FormValidationState)["password"]["show_requirements"],
-                    password_requirements(AuthState.form_validation_state.to(FormValidationState)["password"]["checks"]),
+                password_requirements(
+                    password_v["checks"],
+                    show=password_v["show_requirements"],
+                    count=PASSWORD_CHECK_COUNT,
                 ),
                 
                 rx.button(
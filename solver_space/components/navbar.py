@@ -1,6 +1,45 @@
 import reflex as rx
 from ..models.user import AuthState
 
+# Both cond branches are compiled on every page, so build them once
+_AUTH_BAR = rx.hstack(
+    rx.text(
+        rx.cond(
+            AuthState.user.username,
+            "Welcome, " + AuthState.user.username,
+            "Welcome, User"
+        ),
+        color="white",
+        font_weight="medium",
+    ),
+    rx.button(
+        "Logout",
+        on_click=AuthState.logout,
+        variant="ghost",
+        color="white",
+        _hover={"bg": "whiteAlpha.200"},
+    ),
+    spacing="4",
+)
+
+_GUEST_LINKS = rx.hstack(
+    rx.link(
+        "Login",
+        href="/login",
+        padding="2",
+        color="white",
+        _hover={"text_decoration": "none", "color": "blue.200"},
+    ),
+    rx.link(
+        "Sign Up",
+        href="/signup",
+        padding="2",
+        color="white",
+        _hover={"text_decoration": "none", "color": "blue.200"},
+    ),
+    spacing="2",
+)
+
 def navbar() -> rx.Component:
     """Navigation bar component."""
     return rx.hstack(
@@ -8,42 +47,8 @@ def navbar() -> rx.Component:
         rx.spacer(),
         rx.cond(
             AuthState.user,
-            rx.hstack(
-                rx.text(
-                    rx.cond(
-                        AuthState.user.username,
-                        f"Welcome, {AuthState.user.username}",
-                        "Welcome, User"
-                    ),
-                    color="white",
-                    font_weight="medium",
-                ),
-                rx.button(
-                    "Logout",
-                    on_click=AuthState.logout,
-                    variant="ghost",
-                    color="white",
-                    _hover={"bg": "whiteAlpha.200"},
-                ),
-                spacing="4",
-            ),
-            rx.hstack(
-                rx.link(
-                    "Login",
-                    href="/login",
-                    padding="2",
-                    color="white",
-                    _hover={"text_decoration": "none", "color": "blue.200"},
-                ),
-                rx.link(
-                    "Sign Up",
-                    href="/signup",
-                    padding="2",
-                    color="white",
-                    _hover={"text_decoration": "none", "color": "blue.200"},
-                ),
-                spacing="2",
-            ),
+            _AUTH_BAR,
+            _GUEST_LINKS,
         ),
         width="100%",
         padding="4",
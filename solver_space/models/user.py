@@ -1,15 +1,189 @@
-from typing import Optional, Dict, List, TypedDict
+from typing import Optional, Tuple, TypedDict
 from datetime import datetime
+import functools
+import hashlib
 import reflex as rx
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from ..services.supabase import supabase
 from gotrue.errors import AuthWeakPasswordError
 from ..utils.validators import UsernameValidator
+from ..utils.cache import InFlight, TTLCache
 import re
-from ..utils.validation_types import ValidationCheck, ValidationState, PasswordValidationState, FormValidationState
+from ..utils.validation_types import ValidationState, PasswordValidationState, FormValidationState
+
+# Compiled once at import since email validation runs on every keystroke
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+
+# Sentence breaks in Supabase's weak-password message
+_PW_SPLIT = re.compile(r"\.\s+")
+
+# Toast preset for each notification status, and their shared options
+_TOAST_FNS = {
+    "success": rx.toast.success,
+    "error": rx.toast.error,
+    "warning": rx.toast.warning,
+    "info": rx.toast.info,
+}
+_TOAST_KW = {"duration": 5000, "position": "top-center"}
+
+# How long a fetched username is reused before hitting Supabase again
+PROFILE_CACHE_TTL = 300  # seconds
+PROFILE_CACHE_SIZE = 10_000
+
+# Usernames by auth user id, shared by every session in this process
+_username_cache_by_id: TTLCache[str, str] = TTLCache(
+    maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL
+)
+
+# Concurrent sign-ins with the same credentials (double clicks, several
+# tabs) and concurrent profile reads for the same user share one request.
+# Sign-ins are keyed on a password digest so plaintext is never held as a key.
+_sign_ins: InFlight[tuple, object] = InFlight()
+_username_loads: InFlight[tuple, Optional[str]] = InFlight()
+
+# Concurrent signups checking the same username share one lookup. Only the
+# in-flight request is shared, never a stored answer: claim_username settles
+# who actually gets the name.
+_username_checks: InFlight[str, bool] = InFlight()
+
+async def _load_username(user_id: str, create_with: Optional[str]) -> Optional[str]:
+    """Read a profile's username, creating the profile if create_with is given."""
+    if create_with is None:
+        response = await supabase.table('profiles').select('username').eq('id', user_id).limit(1).maybe_single().execute()
+        # maybe_single() yields no response at all when the row is missing
+        return response.data.get('username') if response is not None and response.data else None
+    response = await supabase.rpc('ensure_profile', {
+        'uid': user_id,
+        'fallback_username': create_with,
+    }).execute()
+    return response.data
+
+async def _username_taken(username: str) -> bool:
+    """Check whether a profile already uses username.
+
+    A head-only count query: PostgREST answers with a Content-Range header
+    and no JSON body.
+    """
+    response = await supabase.table('profiles').select(
+        'id', count='exact', head=True
+    ).eq('username', username).execute()
+    return (response.count or 0) > 0
+
+# Password requirement messages, in display order
+_PASSWORD_RULES = (
+    "One lowercase letter",
+    "One uppercase letter",
+    "One number",
+    "One special character",
+    "Minimum 8 characters",
+)
+
+# Every non-empty password yields exactly one check per rule
+PASSWORD_CHECK_COUNT = len(_PASSWORD_RULES)
+
+# Character class of each ASCII code: 1 lower, 2 upper, 3 digit, 4 special.
+# Only the first 128 entries are ever used; the rest pad it to a full
+# bytes.translate table.
+_ASCII_CLASSES = bytes(
+    1 if chr(i).islower() else
+    2 if chr(i).isupper() else
+    3 if chr(i).isdigit() else
+    4
+    for i in range(128)
+) + bytes(128)
+
+def _password_flags(password: str) -> Tuple[bool, bool, bool, bool, bool]:
+    """Evaluate every password rule with a single scan, in rule order."""
+    if password.isascii():
+        # Classify every character in C, then test for each class with memchr
+        classes = password.encode("ascii").translate(_ASCII_CLASSES)
+        return 1 in classes, 2 in classes, 3 in classes, 4 in classes, len(password) >= 8
+    
+    has_lower = has_upper = has_digit = has_special = False
+    for c in password:
+        if not has_lower and c.islower():
+            has_lower = True
+        elif not has_upper and c.isupper():
+            has_upper = True
+        elif not has_digit and c.isdigit():
+            has_digit = True
+        # Cased symbols such as 'ⓐ' are both a letter case and special
+        if not has_special and not c.isalnum():
+            has_special = True
+        if has_lower and has_upper and has_digit and has_special:
+            break
+    return has_lower, has_upper, has_digit, has_special, len(password) >= 8
+
+def _with_processing(fn):
+    """Mark the state as processing and clear the last error while the
+    wrapped event generator runs.
+
+    Only for underscore helpers: Reflex reads a public handler's argument
+    names from its code object, which the wrapper would hide.
+    """
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        self.processing = True
+        self.error = None
+        try:
+            async for event in fn(self, *args, **kwargs):
+                yield event
+        finally:
+            self.processing = False
+    return wrapper
+
+# UsernameValidator holds no per-instance state, so one is shared
+_USERNAME_VALIDATOR = UsernameValidator()
+
+@functools.lru_cache(maxsize=1024)
+def _validate_username_cached(username: str) -> Tuple[bool, str]:
+    """Validate a username, memoized across every session in this process."""
+    return _USERNAME_VALIDATOR.validate(username)
+
+@functools.lru_cache(maxsize=None)
+def _password_result(flags: Tuple[bool, ...]) -> Tuple[bool, Tuple[Tuple[bool, str], ...]]:
+    """Return overall validity and (passed, message) checks for rule flags.
+
+    Keyed on the flags from ``_password_flags`` rather than the password,
+    so there are at most 32 entries and no plaintext passwords are kept.
+    """
+    return all(flags), tuple(zip(flags, _PASSWORD_RULES))
+
+# Fixed validation results, shared by every session. Never mutate these.
+_EMPTY_VALID: ValidationState = {"valid": True, "message": ""}
+_EMAIL_REQUIRED: ValidationState = {"valid": False, "message": "Email is required"}
+_EMAIL_INVALID: ValidationState = {"valid": False, "message": "Please enter a valid email address"}
+_EMPTY_PASSWORD_STATE: PasswordValidationState = {
+    "valid": True,
+    "message": "",
+    "checks": [],
+    "show_requirements": False,
+}
+_EMPTY_FORM_STATE: FormValidationState = {
+    "username": _EMPTY_VALID,
+    "password": _EMPTY_PASSWORD_STATE,
+    "email": _EMPTY_VALID,
+}
+
+# Results for input too short to be worth a cache probe
+_TOO_SHORT_USERNAME: ValidationState = {
+    "valid": False,
+    "message": UsernameValidator.ERROR_LENGTH,
+}
+_EMPTY_PASSWORD_RESULT: PasswordValidationState = {
+    "valid": False,
+    "message": "Password requirements not met",
+    "checks": [{"passed": False, "message": message} for message in _PASSWORD_RULES],
+    "show_requirements": False,
+}
 
 class User(BaseModel):
-    """User model for authentication."""
+    """User model for authentication.
+
+    Frozen: build a new instance (or ``model_copy``) instead of mutating.
+    """
+    model_config = ConfigDict(frozen=True)
+
     id: str
     email: str
     username: Optional[str] = None
@@ -35,29 +209,8 @@ class AuthState(rx.State):
     username_touched: bool = False
     password_touched: bool = False
     
-    # Validation caches
-    _username_cache: Dict[str, ValidationState] = {}
-    _password_cache: Dict[str, PasswordValidationState] = {}
-    
     # Email validation regex
-    EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    
-    def _get_password_checks(self, password: str) -> List[ValidationCheck]:
-        """Get password requirement checks.
-        
-        Args:
-            password: The password to validate
-            
-        Returns:
-            List of check results with pass/fail status and messages
-        """
-        return [
-            {"passed": any(c.islower() for c in password), "message": "One lowercase letter"},
-            {"passed": any(c.isupper() for c in password), "message": "One uppercase letter"},
-            {"passed": any(c.isdigit() for c in password), "message": "One number"},
-            {"passed": any(not c.isalnum() for c in password), "message": "One special character"},
-            {"passed": len(password) >= 8, "message": "Minimum 8 characters"},
-        ]
+    EMAIL_REGEX = _EMAIL_RE.pattern
     
     def _validate_username(self, username: str) -> ValidationState:
         """Validate username with caching.
@@ -68,20 +221,10 @@ class AuthState(rx.State):
         Returns:
             Dict containing validation result and message
         """
-        if username in self._username_cache:
-            return self._username_cache[username]
-            
-        validator = UsernameValidator()
-        is_valid, error_message = validator.validate(username)
-        result: ValidationState = {"valid": is_valid, "message": error_message}
-        
-        # Cache only if username is long enough to avoid cache pollution
-        if len(username) > 2:
-            self._username_cache[username] = result
-            # Limit cache size to prevent memory issues
-            if len(self._username_cache) > 1000:
-                self._username_cache.pop(next(iter(self._username_cache)))
-        return result
+        if len(username) < UsernameValidator.MIN_LENGTH:
+            return _TOO_SHORT_USERNAME
+        is_valid, error_message = _validate_username_cached(username)
+        return {"valid": is_valid, "message": error_message}
     
     def _validate_password(self, password: str) -> PasswordValidationState:
         """Validate password with caching and progressive feedback.
@@ -92,41 +235,25 @@ class AuthState(rx.State):
         Returns:
             Dict containing validation result, message, and requirement checks
         """
-        if password in self._password_cache:
-            return self._password_cache[password]
-            
-        checks = self._get_password_checks(password)
-        all_passed = all(check["passed"] for check in checks)
-        
-        result: PasswordValidationState = {
+        if not password:
+            return _EMPTY_PASSWORD_RESULT
+        all_passed, checks = _password_result(_password_flags(password))
+        return {
             "valid": all_passed,
             "message": "" if all_passed else "Password requirements not met",
-            "checks": checks,
+            "checks": [{"passed": passed, "message": message} for passed, message in checks],
             "show_requirements": len(password) > 0
         }
-        
-        # Cache only if password is long enough
-        if len(password) > 4:
-            self._password_cache[password] = result
-            # Limit cache size
-            if len(self._password_cache) > 1000:
-                self._password_cache.pop(next(iter(self._password_cache)))
-        return result
     
     @rx.var
     def form_validation_state(self) -> FormValidationState:
         """Combined form validation state for all fields."""
-        empty_password_state: PasswordValidationState = {
-            "valid": True,
-            "message": "",
-            "checks": [],
-            "show_requirements": False
-        }
-        empty_validation_state: ValidationState = {"valid": True, "message": ""}
-        
+        # Nothing to validate until a field has been edited
+        if not (self.email_touched or self.username_touched or self.password_touched):
+            return _EMPTY_FORM_STATE
         return {
-            "username": self._validate_username(self.username) if self.username_touched else empty_validation_state,
-            "password": self._validate_password(self.password) if self.password_touched else empty_password_state,
+            "username": self._validate_username(self.username) if self.username_touched else _EMPTY_VALID,
+            "password": self._validate_password(self.password) if self.password_touched else _EMPTY_PASSWORD_STATE,
             "email": self.email_validation_state
         }
     
@@ -134,35 +261,47 @@ class AuthState(rx.State):
     def email_validation_state(self) -> ValidationState:
         """Validate email format and return validation state."""
         if not self.email_touched:
-            return {"valid": True, "message": ""}
+            return _EMPTY_VALID
         if not self.email:
-            return {"valid": False, "message": "Email is required"}
-        if not re.match(self.EMAIL_REGEX, self.email):
-            return {"valid": False, "message": "Please enter a valid email address"}
-        return {"valid": True, "message": ""}
+            return _EMAIL_REQUIRED
+        if not _EMAIL_RE.match(self.email):
+            return _EMAIL_INVALID
+        return _EMPTY_VALID
     
     def handle_email_change(self, value: str):
         """Handle email input changes."""
+        if value == self.email:
+            return
         self.email = value
-        self.email_touched = True
-        self.error = None
+        if not self.email_touched:
+            self.email_touched = True
+        if self.error is not None:
+            self.error = None
     
     def handle_username_change(self, value: str):
         """Handle username input changes."""
+        if value == self.username:
+            return
         self.username = value
-        self.username_touched = True
-        self.error = None
+        if not self.username_touched:
+            self.username_touched = True
+        if self.error is not None:
+            self.error = None
     
     def handle_password_change(self, value: str):
         """Handle password input changes."""
+        if value == self.password:
+            return
         self.password = value
-        self.password_touched = True
-        self.error = None
+        if not self.password_touched:
+            self.password_touched = True
+        if self.error is not None:
+            self.error = None
     
     def _format_password_requirements(self, error_message: str) -> str:
         """Format password requirements into bullet points."""
-        requirements = error_message.split(". ")
-        return "Password requirements:\n" + "\n".join(f"• {req}" for req in requirements)
+        requirements = _PW_SPLIT.split(error_message.strip().rstrip("."))
+        return "Password requirements:\n• " + "\n• ".join(requirements)
 
     def show_notification(self, message: str, status: str = "info"):
         """Show a toast notification using Reflex's built-in presets.
@@ -171,111 +310,135 @@ class AuthState(rx.State):
             message: The message to display
             status: One of "success", "error", "warning", "info"
         """
-        match status:
-            case "success":
-                return rx.toast.success(message, duration=5000, position="top-center")
-            case "error":
-                return rx.toast.error(message, duration=5000, position="top-center")
-            case "warning":
-                return rx.toast.warning(message, duration=5000, position="top-center")
-            case "info":
-                return rx.toast.info(message, duration=5000, position="top-center")
-            case _:
-                return rx.toast.info(message, duration=5000, position="top-center")
-
-    def on_load(self):
+        return _TOAST_FNS.get(status, rx.toast.info)(message, **_TOAST_KW)
+
+    async def _fetch_username(self, user_id: str, create_with: Optional[str] = None) -> Optional[str]:
+        """Fetch a user's profile username, reading through the process-wide cache.
+        
+        Args:
+            user_id: The auth user id the profile belongs to
+            create_with: If given, a missing profile is created with this
+                username in the same round trip (see ``ensure_profile``)
+            
+        Returns:
+            The profile's username, or None if there is no profile
+        """
+        username = _username_cache_by_id.get(user_id)
+        if username:
+            return username
+        
+        username = await _username_loads.run(
+            (user_id, create_with), lambda: _load_username(user_id, create_with)
+        )
+        
+        if username:
+            _username_cache_by_id[user_id] = username
+        return username
+
+    async def on_load(self):
         """Check if user is already logged in on page load."""
         try:
             # Get session from Supabase
-            session = supabase.auth.get_session()
+            session = await supabase.auth.get_session()
             if session:
+                # Fetch additional user data from profiles table
+                username = await self._fetch_username(session.user.id)
                 self.user = User(
                     id=session.user.id,
                     email=session.user.email,
+                    username=username,
                     created_at=session.user.created_at,
                 )
-                # Fetch additional user data from profiles table
-                profile = supabase.table('profiles').select('*').eq('id', session.user.id).single().execute()
-                if profile.data:
-                    self.user.username = profile.data.get('username')
         except Exception:
             self.user = None
 
+    @_with_processing
     async def _login(self, email: str, password: str):
         """Handle login."""
-        self.processing = True
-        self.error = None
         try:
             # Sign in and get session data
-            auth_response = supabase.auth.sign_in_with_password({
-                "email": email,
-                "password": password
-            })
+            auth_response = await _sign_ins.run(
+                (email, hashlib.sha256(password.encode()).digest()),
+                lambda: supabase.auth.sign_in_with_password({
+                    "email": email,
+                    "password": password
+                }),
+            )
             
             # Get user data from the session
             user_data = auth_response.user
             if not user_data:
                 self.error = "Invalid email or password"
-                return self.show_notification("Invalid email or password", "error")
+                yield self.show_notification("Invalid email or password", "error")
+                return
             
-            # Create base user object
+            # Use email prefix as fallback username
+            fallback_username = email.partition('@')[0]
+            try:
+                # Fetch profile data, creating the profile if it doesn't exist.
+                # Drop any cached username so a fresh login always re-reads it.
+                _username_cache_by_id.pop(user_data.id)
+                username = await self._fetch_username(user_data.id, create_with=fallback_username)
+            except Exception as profile_error:
+                # Log profile error but don't fail login
+                print(f"Error fetching profile: {profile_error}")
+                username = None
+            
+            # Build the user once the username is known
             self.user = User(
                 id=user_data.id,
                 email=user_data.email,
+                username=username or fallback_username,
                 created_at=user_data.created_at,
             )
             
-            try:
-                # Fetch profile data
-                profile = supabase.table('profiles').select('*').eq('id', user_data.id).single().execute()
-                if profile and profile.data:
-                    self.user.username = profile.data.get('username')
-                else:
-                    # Handle case where profile doesn't exist
-                    self.user.username = email.split('@')[0]  # Use email prefix as fallback username
-                    # Create profile if it doesn't exist
-                    await supabase.table('profiles').insert({
-                        'id': user_data.id,
-                        'username': self.user.username,
-                    }).execute()
-            except Exception as profile_error:
-                # Log profile error but don't fail login
-                print(f"Error fetching profile: {profile_error}")
-                self.user.username = email.split('@')[0]  # Use email prefix as fallback
-            
             # Show welcome message and redirect
             welcome_name = self.user.username or "back"
-            return [
-                self.show_notification(f"Welcome {welcome_name}!", "success"),
-                rx.redirect('/')
-            ]
+            yield self.show_notification(f"Welcome {welcome_name}!", "success")
+            yield rx.redirect('/')
         except Exception as e:
             self.error = "Invalid email or password"
-            return self.show_notification("Invalid email or password", "error")
-        finally:
-            self.processing = False
+            yield self.show_notification("Invalid email or password", "error")
 
-    async def _signup(self, email: str, password: str, username: str):
-        """Handle signup."""
-        self.processing = True
-        self.error = None
+    @_with_processing
+    async def _signup(self, email: str, password: str, username: str, *, pre_validated: bool = False):
+        """Handle signup.
+        
+        Args:
+            pre_validated: The caller already validated this exact username
+        """
         try:
             # Validate username
-            username_validator = UsernameValidator()
-            is_valid, error_message = username_validator.validate(username)
-            if not is_valid:
-                self.error = error_message
-                return self.show_notification(error_message, "error")
-
-            # Check username availability
-            existing_profile = supabase.table('profiles').select('username').eq('username', username).execute()
-            if existing_profile.data:
+            if not pre_validated:
+                is_valid, error_message = _USERNAME_VALIDATOR.validate(username)
+                if not is_valid:
+                    self.error = error_message
+                    yield self.show_notification(error_message, "error")
+                    return
+
+            # Supabase would reject a weak password anyway, but only after a
+            # round trip. The check is a single scan, so run it even when the
+            # form already validated the password.
+            if not _password_result(_password_flags(password))[0]:
+                self.error = "Password does not meet requirements"
+                yield self.show_notification(self.error, "error")
+                return
+
+            # Reject a taken username before creating the auth user.
+            # claim_username below is still the atomic backstop for a
+            # concurrent signup claiming the same name.
+            sanitized_username = _USERNAME_VALIDATOR.sanitize(username)
+            if await _username_checks.run(
+                sanitized_username,
+                lambda: _username_taken(sanitized_username),
+            ):
                 self.error = "Username already taken"
-                return self.show_notification("Username already taken", "error")
+                yield self.show_notification("Username already taken", "error")
+                return
 
             # Create auth user
             try:
-                auth_response = supabase.auth.sign_up({
+                auth_response = await supabase.auth.sign_up({
                     "email": email,
                     "password": password,
                 })
@@ -283,43 +446,64 @@ class AuthState(rx.State):
                 error_str = str(e)
                 if "invalid format" in error_str.lower():
                     self.error = "Please enter a valid email address"
-                    return self.show_notification(self.error, "error")
+                    yield self.show_notification(self.error, "error")
+                    return
                 elif "User already registered" in error_str:
                     self.error = "Email already registered"
-                    return [
-                        self.show_notification("Email already registered. Please login.", "info"),
-                        rx.redirect('/login')
-                    ]
+                    yield self.show_notification("Email already registered. Please login.", "info")
+                    yield rx.redirect('/login')
+                    return
                 else:
                     print(f"Signup error: {e}")  # Log the actual error
                     self.error = "An error occurred. Please try again."
-                    return self.show_notification(self.error, "error")
+                    yield self.show_notification(self.error, "error")
+                    return
             
             if not auth_response.user:
                 self.error = "Signup failed"
-                return self.show_notification("Signup failed", "error")
+                yield self.show_notification("Signup failed", "error")
+                return
             
+            # Create profile with sanitized username. claim_username inserts
+            # it atomically and reports whether the username was still free.
             try:
-                # Create profile with sanitized username
-                sanitized_username = username_validator.sanitize(username)
-                profile_response = await supabase.table('profiles').insert({
-                    'id': auth_response.user.id,
-                    'username': sanitized_username,
+                claim_response = await supabase.rpc('claim_username', {
+                    'uid': auth_response.user.id,
+                    'uname': sanitized_username,
                 }).execute()
 
-                if not profile_response.data:
-                    # If profile creation fails, we should still log the user in
-                    print("Profile creation failed, but user was created")
+                if not claim_response.data:
+                    # Someone claimed the name since the check above. The
+                    # account exists now, so don't suggest retrying signup;
+                    # end any session it started and send the user to login.
+                    # No error is set: the login form would show it as a
+                    # failure next to this notice.
+                    if auth_response.session:
+                        try:
+                            await supabase.auth.sign_out()
+                        except Exception as sign_out_error:
+                            print(f"Sign out error: {sign_out_error}")
+                    yield self.show_notification(
+                        "Your account was created, but that username was just taken. "
+                        "Please log in; you will get a default username.",
+                        "info",
+                    )
+                    yield rx.redirect('/login')
+                    return
+                _username_cache_by_id[auth_response.user.id] = sanitized_username
             except Exception as profile_error:
                 # Log the profile error but continue with login
                 print(f"Profile creation error: {profile_error}")
             
-            # Log the user in immediately after signup
+            # Log the user in immediately after signup. sign_up already returns
+            # a session unless email confirmation is required, so only sign in
+            # again when it didn't.
             try:
-                login_response = supabase.auth.sign_in_with_password({
-                    "email": email,
-                    "password": password
-                })
+                if not auth_response.session:
+                    await supabase.auth.sign_in_with_password({
+                        "email": email,
+                        "password": password
+                    })
                 
                 # Set user data
                 self.user = User(
@@ -330,37 +514,30 @@ class AuthState(rx.State):
                 )
                 
                 # Show success message and redirect
-                return [
-                    self.show_notification(f"Welcome {sanitized_username}!", "success"),
-                    rx.redirect('/')
-                ]
+                yield self.show_notification(f"Welcome {sanitized_username}!", "success")
+                yield rx.redirect('/')
             except Exception as login_error:
                 print(f"Auto-login error: {login_error}")
-                return [
-                    self.show_notification("Account created! Please log in.", "success"),
-                    rx.redirect('/login')
-                ]
+                yield self.show_notification("Account created! Please log in.", "success")
+                yield rx.redirect('/login')
             
         except AuthWeakPasswordError as e:
             print(f"Password validation error: {e.message}")  # Log the raw error
             self.error = self._format_password_requirements(e.message)
-            return self.show_notification(self.error, "error")
-        finally:
-            self.processing = False
+            yield self.show_notification(self.error, "error")
 
     async def verify_otp(self, token: str):
         """Verify OTP token."""
         if not self.temp_email or not self.temp_username:
-            return [
-                self.show_notification("Please sign up again", "error"),
-                rx.redirect('/signup')
-            ]
+            yield self.show_notification("Please sign up again", "error")
+            yield rx.redirect('/signup')
+            return
 
         self.processing = True
         self.error = None
         try:
             # Verify OTP
-            response = supabase.auth.verify_otp({
+            response = await supabase.auth.verify_otp({
                 "email": self.temp_email,
                 "token": token,
                 "type": "email"
@@ -372,18 +549,17 @@ class AuthState(rx.State):
                     'id': response.user.id,
                     'username': self.temp_username,
                 }).execute()
+                _username_cache_by_id[response.user.id] = self.temp_username
                 
                 # Clear temporary data
                 self.temp_email = None
                 self.temp_username = None
                 
-                return [
-                    self.show_notification("Email verified successfully!", "success"),
-                    rx.redirect('/login')
-                ]
+                yield self.show_notification("Email verified successfully!", "success")
+                yield rx.redirect('/login')
         except Exception as e:
             self.error = "Invalid or expired code"
-            return self.show_notification(self.error, "error")
+            yield self.show_notification(self.error, "error")
         finally:
             self.processing = False
     
@@ -396,7 +572,8 @@ class AuthState(rx.State):
             ]
         
         try:
-            await supabase.auth.resend_signup_otp({
+            await supabase.auth.resend({
+                "type": "signup",
                 "email": self.temp_email,
             })
             return self.show_notification("New code sent to your email", "success")
@@ -406,7 +583,9 @@ class AuthState(rx.State):
     async def logout(self):
         """Handle logout."""
         try:
-            supabase.auth.sign_out()
+            await supabase.auth.sign_out()
+            if self.user:
+                _username_cache_by_id.pop(self.user.id)
             self.user = None
             return [
                 self.show_notification("Logged out successfully", "info"),
@@ -419,17 +598,36 @@ class AuthState(rx.State):
     async def handle_login_form(self, form_data: dict):
         """Handle login form submission."""
         try:
-            return await self._login(
-                email=form_data.get("email", ""),
-                password=form_data.get("password", "")
-            )
+            email = form_data.get("email", "")
+            password = form_data.get("password", "")
+            # Don't spend a Supabase round trip on an empty submit
+            if not email or not password:
+                self.error = "Please fill in all required fields"
+                yield self.show_notification(self.error, "error")
+                return
+            
+            async for event in self._login(email=email, password=password):
+                yield event
         except KeyError:
             self.error = "Please fill in all required fields"
-            return self.show_notification("Please fill in all required fields", "error")
+            yield self.show_notification("Please fill in all required fields", "error")
 
     async def handle_signup_form(self, form_data: dict):
         """Handle signup form submission."""
         try:
+            email = form_data.get("email", "")
+            password = form_data.get("password", "")
+            username = form_data.get("username", "")
+            # Reject empty or malformed submits before any network I/O
+            if not email or not password or not username:
+                self.error = "Please fill in all required fields"
+                yield self.show_notification(self.error, "error")
+                return
+            if not _EMAIL_RE.match(email):
+                self.error = "Please enter a valid email address"
+                yield self.show_notification(self.error, "error")
+                return
+            
             # Set all fields as touched
             self.email_touched = True
             self.username_touched = True
@@ -441,32 +639,39 @@ class AuthState(rx.State):
             # Check email format
             if not validation_state["email"]["valid"]:
                 self.error = validation_state["email"]["message"]
-                return self.show_notification(self.error, "error")
+                yield self.show_notification(self.error, "error")
+                return
             
             # Check username
             if not validation_state["username"]["valid"]:
                 self.error = validation_state["username"]["message"]
-                return self.show_notification(self.error, "error")
+                yield self.show_notification(self.error, "error")
+                return
             
             # Check password
             if not validation_state["password"]["valid"]:
                 self.error = "Password does not meet requirements"
-                return self.show_notification(self.error, "error")
+                yield self.show_notification(self.error, "error")
+                return
             
-            # Proceed with signup
-            return await self._signup(
-                email=form_data.get("email", ""),
-                password=form_data.get("password", ""),
-                username=form_data.get("username", "")
-            )
+            # Proceed with signup. The form state validated self.username,
+            # which only covers the submitted value if the two match.
+            async for event in self._signup(
+                email=email,
+                password=password,
+                username=username,
+                pre_validated=username == self.username,
+            ):
+                yield event
         except KeyError:
             self.error = "Please fill in all required fields"
-            return self.show_notification("Please fill in all required fields", "error")
+            yield self.show_notification("Please fill in all required fields", "error")
 
     async def handle_verify_form(self, form_data: dict):
         """Handle verification form submission."""
         try:
-            return await self.verify_otp(form_data.get("token", ""))
+            async for event in self.verify_otp(form_data.get("token", "")):
+                yield event
         except KeyError:
             self.error = "Please enter the verification code"
-            return self.show_notification("Please enter the verification code", "error")
+            yield self.show_notification("Please enter the verification code", "error")
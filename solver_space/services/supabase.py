@@ -1,12 +1,96 @@
 import os
-from supabase import create_client, Client
+import socket
+from typing import Dict, Optional, Union
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from postgrest.utils import AsyncClient
+from supabase import AsyncClient as AsyncSupabaseClient
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Supabase client
-supabase: Client = create_client(
+# Connection pool for PostgREST requests. Idle connections are kept long
+# enough to span a login -> profile -> page load sequence.
+POSTGREST_POOL_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=30,
+)
+
+# TCP keepalives let the OS notice dead pooled connections
+_KEEPALIVE_SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose HTTP session uses ``POSTGREST_POOL_LIMITS``."""
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> AsyncClient:
+        transport = httpx.AsyncHTTPTransport(
+            verify=verify,
+            http2=True,
+            limits=POSTGREST_POOL_LIMITS,
+            proxy=proxy,
+            socket_options=_KEEPALIVE_SOCKET_OPTIONS,
+        )
+        return AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,
+            transport=transport,
+        )
+
+
+class PooledClient(AsyncSupabaseClient):
+    """Supabase client that keeps one warm PostgREST connection pool.
+
+    The stock client discards its PostgREST client on every sign-in, token
+    refresh and sign-out, so the next query opens a new TLS connection and
+    the old pool is never closed. Here the existing client is kept and only
+    its bearer token is swapped.
+    """
+
+    @staticmethod
+    def _init_postgrest_client(
+        rest_url: str,
+        headers: Dict[str, str],
+        schema: str,
+        timeout: Union[int, float, httpx.Timeout] = DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> AsyncPostgrestClient:
+        return PooledPostgrestClient(
+            rest_url,
+            headers=headers,
+            schema=schema,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+        )
+
+    def _listen_to_auth_events(self, event, session):
+        postgrest = self._postgrest
+        super()._listen_to_auth_events(event, session)
+        if postgrest is not None and self._postgrest is None:
+            postgrest.auth(session.access_token if session else self.supabase_key)
+            self._postgrest = postgrest
+
+
+# Initialize Supabase client. The client is async so requests never block
+# the event loop. AsyncClient.create() only differs from the constructor by
+# reading a stored session, which a freshly started process never has, so
+# the client can be built at import time without a running loop.
+supabase: AsyncSupabaseClient = PooledClient(
     os.getenv("SUPABASE_URL"),
     os.getenv("SUPABASE_KEY")
-)
\ No newline at end of file
+)
@@ -0,0 +1,82 @@
+"""Small in-process caches."""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class TTLCache(Generic[K, V]):
+    """Bounded mapping whose entries expire a fixed time after being set.
+
+    Once ``maxsize`` entries are held, setting a new key evicts the entry
+    that was set longest ago. Expired entries are dropped when read.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable[[], float] = time.monotonic):
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid after it is set
+            timer: Clock used for expiry, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Return the value for key if it is present and fresh, else default."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if self._timer() >= expires_at:
+            del self._data[key]
+            return default
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._data.pop(key, None)
+        self._data[key] = (self._timer() + self.ttl, value)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        """Remove key and return its value if it was still fresh."""
+        entry = self._data.pop(key, None)
+        if entry is None or self._timer() >= entry[0]:
+            return default
+        return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class InFlight(Generic[K, V]):
+    """Coalesces concurrent calls that share a key into a single call.
+
+    While a call for a key is running, later callers with the same key
+    await its result instead of starting their own. Nothing is kept once
+    the call finishes, so this only deduplicates overlapping requests.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[K, "asyncio.Task[V]"] = {}
+
+    def run(self, key: K, factory: Callable[[], Awaitable[V]]) -> "asyncio.Future[V]":
+        """Await the running call for key, starting it with factory if there is none.
+
+        The call is shielded, so a cancelled caller doesn't cancel it for
+        the others.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
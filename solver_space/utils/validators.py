@@ -21,20 +21,27 @@ class UsernameValidator:
     MIN_LENGTH = 3
     MAX_LENGTH = 30
     PATTERN = r'^[a-zA-Z][a-zA-Z0-9_]{2,29}$'
+    _PATTERN_RE = re.compile(PATTERN)
+    _UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_]')
+    # bytes.translate table mapping every unsafe ASCII byte to '_'
+    _SAFE_ASCII = bytes(
+        c if chr(c).isascii() and (chr(c).isalnum() or c == ord('_')) else ord('_')
+        for c in range(256)
+    )
+    
+    # Shared by all instances; compared case-insensitively
+    RESERVED_WORDS = frozenset({
+        'admin', 'administrator', 'root', 'sudo',
+        'www', 'api', 'mail', 'smtp', 'support',
+        'help', 'info', 'contact', 'login', 'logout',
+        'signin', 'signup', 'register', 'password',
+    })
     
     # Error Messages
     ERROR_LENGTH = "Username must be between 3-30 characters"
     ERROR_FORMAT = "Username must start with a letter and contain only letters, numbers, and underscores"
     ERROR_RESERVED = "This username is reserved"
     
-    def __init__(self):
-        self.reserved_words = {
-            'admin', 'administrator', 'root', 'sudo',
-            'www', 'api', 'mail', 'smtp', 'support',
-            'help', 'info', 'contact', 'login', 'logout',
-            'signin', 'signup', 'register', 'password',
-        }
-    
     def validate(self, username: str) -> Tuple[bool, str]:
         """Validate a username against all security rules.
         
@@ -50,11 +57,11 @@ class UsernameValidator:
             
         # Normalize and check format (catches non-Latin chars)
         normalized = self._normalize_for_storage(username)
-        if not re.match(self.PATTERN, normalized):
+        if not self._PATTERN_RE.match(normalized):
             return False, self.ERROR_FORMAT
             
         # Reserved words check
-        if normalized.lower() in self.reserved_words:
+        if normalized.lower() in self.RESERVED_WORDS:
             return False, self.ERROR_RESERVED
             
         return True, ""
@@ -75,7 +82,10 @@ class UsernameValidator:
         username = self._normalize_for_storage(username)
         
         # Replace unsafe characters with underscores
-        username = re.sub(r'[^a-zA-Z0-9_]', '_', username)
+        if username.isascii():
+            username = username.encode('ascii').translate(self._SAFE_ASCII).decode('ascii')
+        else:
+            username = self._UNSAFE_RE.sub('_', username)
         
         # Ensure it starts with a letter
         if not username[0].isalpha():
@@ -93,4 +103,7 @@ class UsernameValidator:
         Returns:
             str: Normalized username
         """
+        # NFKC leaves ASCII unchanged, and most usernames are ASCII
+        if username.isascii():
+            return username
         return unicodedata.normalize('NFKC', username) 
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""Shared pytest setup."""
+
+import os
+
+# solver_space.services.supabase builds the client at import time. Give it
+# well-formed placeholder credentials; the tests never send a request.
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.placeholder")
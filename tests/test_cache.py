@@ -0,0 +1,125 @@
+"""
+test_cache.py
+-------------
+Tests for the in-process caches used to avoid repeated Supabase lookups.
+"""
+
+import asyncio
+
+from solver_space.utils.cache import InFlight, TTLCache
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_get_returns_fresh_entries():
+    """Test that values are returned until their TTL elapses."""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, timer=clock)
+    cache["alice"] = "a"
+
+    clock.now = 4.9
+    assert cache.get("alice") == "a"
+
+    clock.now = 5.0
+    assert cache.get("alice") is None
+    assert len(cache) == 0, "Expired entries should be dropped on read"
+
+def test_get_missing_returns_default():
+    """Test the default for keys that were never set."""
+    cache = TTLCache(maxsize=10, ttl=5)
+    assert cache.get("missing") is None
+    assert cache.get("missing", "fallback") == "fallback"
+
+def test_set_refreshes_ttl():
+    """Test that setting an existing key restarts its TTL."""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, timer=clock)
+    cache["alice"] = "a"
+
+    clock.now = 4
+    cache["alice"] = "b"
+
+    clock.now = 8
+    assert cache.get("alice") == "b"
+
+def test_oldest_entry_evicted_when_full():
+    """Test that the least recently set entry is evicted past maxsize."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["a"] = 3  # Re-setting moves "a" to the newest position
+    cache["c"] = 4
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+
+def test_pop_invalidates():
+    """Test that pop removes entries and ignores expired ones."""
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, timer=clock)
+    cache["alice"] = "a"
+    cache["bob"] = "b"
+
+    assert cache.pop("alice") == "a"
+    assert cache.get("alice") is None
+
+    clock.now = 10
+    assert cache.pop("bob") is None, "Expired entries should not be returned"
+    assert cache.pop("missing", "x") == "x"
+    assert len(cache) == 0
+
+async def test_inflight_coalesces_concurrent_calls():
+    """Test that overlapping calls with one key share a single call."""
+    inflight = InFlight()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key.upper()
+
+    results = await asyncio.gather(
+        inflight.run("a", lambda: fetch("a")),
+        inflight.run("a", lambda: fetch("a")),
+        inflight.run("b", lambda: fetch("b")),
+    )
+    assert results == ["A", "A", "B"]
+    assert calls == ["a", "b"]
+    assert len(inflight) == 0, "Finished calls should not be kept"
+
+async def test_inflight_runs_again_after_completion():
+    """Test that a key is fetched again once its earlier call finished."""
+    inflight = InFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    first = await inflight.run("a", fetch)
+    await asyncio.sleep(0)  # Let the done callback clear the key
+    second = await inflight.run("a", fetch)
+    assert (first, second) == (1, 2)
+
+async def test_inflight_shares_errors():
+    """Test that every waiting caller sees the shared call's exception."""
+    inflight = InFlight()
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        inflight.run("a", fail),
+        inflight.run("a", fail),
+        return_exceptions=True,
+    )
+    assert all(isinstance(r, ValueError) for r in results)
@@ -0,0 +1,79 @@
+"""
+test_password_rules.py
+----------------------
+Tests for the password requirement checks shown on the signup form.
+The fast rule scan must agree with the plain per-rule predicates, for
+ASCII (table lookup) and non-ASCII (character loop) passwords alike.
+"""
+
+import string
+
+from solver_space.models.user import _password_flags, _password_result
+
+def reference_flags(password):
+    """The original one-predicate-per-rule checks, in rule order."""
+    return (
+        any(c.islower() for c in password),
+        any(c.isupper() for c in password),
+        any(c.isdigit() for c in password),
+        any(not c.isalnum() for c in password),
+        len(password) >= 8,
+    )
+
+def test_every_ascii_character():
+    """Test that each ASCII character, including controls, is classified correctly."""
+    for code in range(128):
+        password = chr(code)
+        assert _password_flags(password) == reference_flags(password), f"Mismatch for {code!r}"
+
+def test_ascii_passwords():
+    """Test typical and edge-case ASCII passwords."""
+    cases = [
+        "",                     # Empty
+        "abcdefgh",             # Lowercase only, minimum length
+        "ABC",                  # Uppercase only
+        "1234567",              # Digits, one short of minimum
+        string.punctuation,     # Every ASCII special character
+        "\t\n\x00\x7f",         # Control characters count as special
+        " ",                    # Space counts as special
+        "Passw0rd!",            # Meets every rule
+        string.printable,       # Everything at once
+    ]
+    
+    for password in cases:
+        assert _password_flags(password) == reference_flags(password), f"Mismatch for {password!r}"
+
+def test_non_ascii_passwords():
+    """Test passwords that take the non-ASCII path."""
+    cases = [
+        "é",            # Lowercase Latin-1 letter
+        "É",            # Uppercase Latin-1 letter
+        "ß",            # Lowercase with no single-char uppercase
+        "²",            # Superscript two: a digit, not a special character
+        "ǅ",            # Titlecase: neither lower nor upper
+        "名",           # CJK: alphanumeric but no case
+        "€",            # Non-ASCII symbol counts as special
+        "Pässwörd1",    # Mixed ASCII and non-ASCII
+        "ǅ²名!aB",      # Every class together
+        "ⓐ",            # Lowercase and special at once
+        "Ⓐ",            # Uppercase and special at once
+        "\u0345",       # Combining ypogegrammeni: lowercase and special
+        "ⓐBc1defgh",    # Only special character is also lowercase
+    ]
+    
+    for password in cases:
+        assert _password_flags(password) == reference_flags(password), f"Mismatch for {password!r}"
+
+def test_every_non_ascii_bmp_character():
+    """Test that each non-ASCII BMP character is classified correctly."""
+    for code in range(128, 0x10000):
+        password = chr(code)
+        assert _password_flags(password) == reference_flags(password), f"Mismatch for U+{code:04X}"
+        # Prefix an ASCII character that already set an earlier flag
+        password = "a" + chr(code)
+        assert _password_flags(password) == reference_flags(password), f"Mismatch for 'a' + U+{code:04X}"
+
+def test_signup_gate_accepts_cased_special_characters():
+    """Test that the pre-sign_up check accepts passwords the old predicates accepted."""
+    for password in ["ⓐBc1defgh", "Ⓐbc1defgh", "Abc1defgh\u0345"]:
+        assert _password_result(_password_flags(password))[0], f"Rejected {password!r}"
@@ -0,0 +1,38 @@
+"""
+test_supabase_client.py
+-----------------------
+Tests for the pooled Supabase client overrides.
+"""
+
+import base64
+import json
+import os
+from types import SimpleNamespace
+
+from solver_space.services.supabase import PooledClient
+
+def make_token() -> str:
+    """Build an unsigned JWT that realtime accepts (expires in 2100)."""
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": 4102444800}).encode())
+    return f"e30.{payload.decode().rstrip('=')}.signature"
+
+async def test_sign_in_keeps_postgrest_client():
+    """Test that signing in keeps the PostgREST client and swaps its token."""
+    client = PooledClient(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+    postgrest = client.postgrest
+    token = make_token()
+
+    client._listen_to_auth_events("SIGNED_IN", SimpleNamespace(access_token=token))
+
+    assert client.postgrest is postgrest
+    assert postgrest.session.headers["Authorization"] == f"Bearer {token}"
+
+async def test_sign_out_keeps_postgrest_client():
+    """Test that signing out keeps the PostgREST client and restores the anon key."""
+    client = PooledClient(os.environ["SUPABASE_URL"], os.environ["SUPABASE_KEY"])
+    postgrest = client.postgrest
+
+    client._listen_to_auth_events("SIGNED_OUT", None)
+
+    assert client.postgrest is postgrest
+    assert postgrest.session.headers["Authorization"] == f"Bearer {client.supabase_key}"
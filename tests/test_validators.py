@@ -5,6 +5,9 @@ Tests for username validation with security-first approach.
 All non-Latin characters are rejected at format level for maximum security.
 """
 
+import re
+import unicodedata
+
 import pytest
 from solver_space.utils.validators import UsernameValidator
 
@@ -83,4 +86,36 @@ def test_username_sanitization():
     
     for input_name, expected in sanitize_cases:
         result = validator.sanitize(input_name)
-        assert result == expected, f"Expected '{expected}' but got '{result}'" 
\ No newline at end of file
+        assert result == expected, f"Expected '{expected}' but got '{result}'"
+
+def reference_sanitize(username):
+    """The original regex-based sanitize, for comparison."""
+    if not username:
+        return "u"
+    username = unicodedata.normalize('NFKC', username)
+    username = re.sub(r'[^a-zA-Z0-9_]', '_', username)
+    if not username[0].isalpha():
+        username = 'u' + username
+    return username[:UsernameValidator.MAX_LENGTH]
+
+def test_sanitization_matches_regex():
+    """Test that both sanitize paths agree with the regex implementation.
+    ASCII input goes through a translate table, the rest through the regex.
+    """
+    validator = UsernameValidator()
+    cases = [
+        "".join(map(chr, range(128))),  # Every ASCII character
+        "\t user\x00name\x7f",         # Control characters
+        "user-name!",                    # ASCII punctuation
+        "é_user",                        # Latin-1 letter
+        "straße",                        # Sharp s
+        "x²",                            # Superscript two (NFKC → "2")
+        "ǅemal",                         # Titlecase digraph (NFKC → "Dž")
+        "ﬁle",                           # Ligature (NFKC → "fi")
+        "用户名",                         # Non-Latin script
+    ]
+    
+    for username in cases:
+        expected = reference_sanitize(username)
+        result = validator.sanitize(username)
+        assert result == expected, f"Expected '{expected}' but got '{result}' for {username!r}"